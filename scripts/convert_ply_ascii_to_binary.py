@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026
+# Commonwealth Scientific and Industrial Research Organisation (CSIRO)
+# ABN 41 687 119 230
+#
+# Converts an ASCII .ply ray cloud into the binary_little_endian layout used by
+# raycloudtools. The tools themselves (e.g. rayimport) do not accept ASCII ply
+# files, so this script is the preprocessing step for ASCII sources.
+#
+# The input must provide x,y,z,time and colour per vertex, together with either
+# the ray normals nx,ny,nz directly, or the sensor origin ox,oy,oz per point, in
+# which case the normal is computed as origin - point (the ray cloud convention,
+# see raylib/rayply.cpp).
+#
+# usage: convert_ply_ascii_to_binary.py input.ply output.ply
+import argparse
+import sys
+
+import numpy as np
+from numpy.lib import recfunctions as rfn
+
+try:  # numba is optional; without it the NumPy path below is used
+    from numba import njit, prange
+except ImportError:
+    njit = None
+
+# below this many vertices the JIT compile time outweighs the kernel speedup
+NUMBA_MIN_VERTICES = 1000000
+
+if njit is not None:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def fill_ray_vectors(x, y, z, ox, oy, oz, out_nx, out_ny, out_nz):
+        """Threaded fused cast-subtract-store of origin - point per axis."""
+        for i in prange(x.shape[0]):
+            out_nx[i] = np.float32(ox[i]) - np.float32(x[i])
+            out_ny[i] = np.float32(oy[i]) - np.float32(y[i])
+            out_nz[i] = np.float32(oz[i]) - np.float32(z[i])
+
+# target vertex layout, matching writeRayCloudChunkStart in raylib/rayply.cpp
+RAY_CLOUD_DTYPE = np.dtype([('x', '<f4'), ('y', '<f4'), ('z', '<f4'), ('time', '<f8'), ('nx', '<f4'), ('ny', '<f4'),
+                            ('nz', '<f4'), ('red', 'u1'), ('green', 'u1'), ('blue', 'u1'), ('alpha', 'u1')])
+
+PLY_TO_NUMPY_TYPE = {'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1', 'short': 'i2', 'int16': 'i2',
+                     'ushort': 'u2', 'uint16': 'u2', 'int': 'i4', 'int32': 'i4', 'uint': 'u4', 'uint32': 'u4',
+                     'float': 'f4', 'float32': 'f4', 'double': 'f8', 'float64': 'f8'}
+
+# vertex rows parsed, converted and written per pass; bounds peak memory
+CHUNK_SIZE = 1000000
+
+
+def read_ascii_ply_header(f, file_name):
+    """Parse the header of the ASCII ply file open (binary mode) on f, leaving f
+    positioned at the first vertex row. Returns (num_vertices, vertex dtype)."""
+    if f.readline().strip() != b'ply':
+        raise ValueError(f"{file_name} is not a ply file")
+    num_vertices = None
+    properties = []
+    in_vertex_element = False
+    while True:
+        raw_line = f.readline()
+        if raw_line == b'':  # EOF, as opposed to a blank line's b'\n'
+            raise ValueError(f"unexpected end of header in {file_name}")
+        line = raw_line.decode('ascii', 'replace').strip()
+        if line == 'end_header':
+            break
+        parts = line.split()
+        if not parts or parts[0] == 'comment':
+            continue
+        if parts[0] == 'format':
+            if parts[1] != 'ascii':
+                raise ValueError(f"{file_name} is not an ASCII ply file")
+        elif parts[0] == 'element':
+            in_vertex_element = parts[1] == 'vertex'
+            if in_vertex_element:
+                num_vertices = int(parts[2])
+            elif num_vertices is None:
+                raise ValueError(f"vertex must be the first element in {file_name}")
+        elif parts[0] == 'property' and in_vertex_element:
+            type_name, prop_name = parts[1], parts[2]
+            if type_name not in PLY_TO_NUMPY_TYPE:
+                raise ValueError(f"unsupported property type {type_name} in {file_name}")
+            properties.append((prop_name, PLY_TO_NUMPY_TYPE[type_name]))
+    if num_vertices is None:
+        raise ValueError(f"no vertex element in {file_name}")
+    return num_vertices, np.dtype(properties)
+
+
+def write_binary_ply_header(f, num_vertices):
+    """Write the binary ray cloud header for the RAY_CLOUD_DTYPE layout."""
+    numpy_to_ply_type = {'<f4': 'float', '<f8': 'double', '|u1': 'uchar'}
+    header = "ply\nformat binary_little_endian 1.0\ncomment generated by raycloudtools library\n"
+    header += f"element vertex {num_vertices}\n"
+    for field_name in RAY_CLOUD_DTYPE.names:
+        header += f"property {numpy_to_ply_type[RAY_CLOUD_DTYPE[field_name].str]} {field_name}\n"
+    header += "end_header\n"
+    f.write(header.encode('ascii'))
+
+
+def convert_vertex_chunk(vertex_ascii_data, has_normals):
+    """Convert one chunk of parsed ASCII vertex rows to the RAY_CLOUD_DTYPE layout."""
+    final_dtype = RAY_CLOUD_DTYPE
+    if vertex_ascii_data.dtype == final_dtype:
+        # already the target layout, so a single contiguous pass suffices; the
+        # workload is memory bound so avoiding per-field copies is the win
+        vertex_binary_data = np.ascontiguousarray(vertex_ascii_data)
+    else:
+        vertex_binary_data = np.empty(len(vertex_ascii_data), dtype=final_dtype)
+        # coalesce the identically-typed position triple into one 3-wide copy
+        # rather than three separate passes over memory
+        pos = rfn.structured_to_unstructured(vertex_ascii_data[['x', 'y', 'z']], dtype=np.float32)
+        out_pos = rfn.structured_to_unstructured(vertex_binary_data[['x', 'y', 'z']], copy=False)
+        out_pos[:] = pos
+        # any cast is applied while writing into the destination, rather than
+        # through an intermediate astype temporary
+        np.copyto(vertex_binary_data['time'], vertex_ascii_data['time'], casting='unsafe')
+        if has_normals:
+            out_n = rfn.structured_to_unstructured(vertex_binary_data[['nx', 'ny', 'nz']], copy=False)
+            out_n[:] = rfn.structured_to_unstructured(vertex_ascii_data[['nx', 'ny', 'nz']], dtype=np.float32)
+        elif njit is not None and len(vertex_ascii_data) >= NUMBA_MIN_VERTICES:
+            # normal encodes origin - point, as in writeRayCloudChunk. For tens
+            # of millions of vertices the threaded numba kernel fuses the cast,
+            # subtract and store in one pass with no (N,3) intermediate, and
+            # scales with core count on this memory-bandwidth-bound loop
+            fill_ray_vectors(vertex_ascii_data['x'], vertex_ascii_data['y'], vertex_ascii_data['z'],
+                             vertex_ascii_data['ox'], vertex_ascii_data['oy'], vertex_ascii_data['oz'],
+                             vertex_binary_data['nx'], vertex_binary_data['ny'], vertex_binary_data['nz'])
+        else:  # normal encodes origin - point, as in writeRayCloudChunk
+            # pack the origins into an (N,3) float32 block to match pos, then a
+            # single subtract over 3N contiguous elements writes straight into
+            # the nx/ny/nz fields through an unstructured view of the output;
+            # one SIMD-friendly pass instead of three per-axis ufunc calls
+            orig = rfn.structured_to_unstructured(vertex_ascii_data[['ox', 'oy', 'oz']], dtype=np.float32)
+            out_n = rfn.structured_to_unstructured(vertex_binary_data[['nx', 'ny', 'nz']], copy=False)
+            np.subtract(orig, pos, out=out_n)
+        colour_fields = ['red', 'green', 'blue', 'alpha']
+        if all(vertex_ascii_data.dtype[field_name] == np.uint8 for field_name in colour_fields):
+            # already bytes, so copy all four colour channels as one contiguous
+            # 4-byte block per record instead of four separate field passes
+            out_rgba = rfn.structured_to_unstructured(vertex_binary_data[colour_fields], copy=False)
+            out_rgba[:] = rfn.structured_to_unstructured(vertex_ascii_data[colour_fields])
+        else:
+            for field_name in colour_fields:
+                # as for time, the cast happens while storing to the destination
+                np.copyto(vertex_binary_data[field_name], vertex_ascii_data[field_name], casting='unsafe')
+    return vertex_binary_data
+
+
+def convert_ply_ascii_to_binary(input_filepath, output_filepath):
+    """Convert the ASCII ply ray cloud at input_filepath to binary at output_filepath."""
+    # plyfile tokenizes ASCII bodies line by line in Python, which dominates the
+    # runtime for large clouds; parsing the body with np.loadtxt keeps the hot
+    # loop in C, so only the header is read by hand here. The body is parsed,
+    # converted and written in bounded chunks, so peak memory stays at one
+    # chunk's worth rather than two full copies of the cloud
+    with open(input_filepath, 'rb') as fin:
+        num_vertices, input_dtype = read_ascii_ply_header(fin, input_filepath)
+        field_names = input_dtype.names
+
+        has_normals = all(field in field_names for field in ('nx', 'ny', 'nz'))
+        required_input_fields = {'x', 'y', 'z', 'time', 'red', 'green', 'blue', 'alpha'}
+        if not has_normals:
+            required_input_fields |= {'ox', 'oy', 'oz'}
+        missing_fields = required_input_fields - set(field_names)
+        if missing_fields:
+            raise ValueError(f"required fields {sorted(missing_fields)} missing from {input_filepath}")
+
+        with open(output_filepath, 'wb') as fout:
+            write_binary_ply_header(fout, num_vertices)
+            num_read = 0
+            while num_read < num_vertices:
+                max_rows = min(CHUNK_SIZE, num_vertices - num_read)
+                vertex_ascii_data = np.atleast_1d(np.loadtxt(fin, dtype=input_dtype, max_rows=max_rows))
+                if len(vertex_ascii_data) == 0:
+                    raise ValueError(f"expected {num_vertices} vertices in {input_filepath}, read {num_read}")
+                # tofile writes straight from the array buffer via fwrite, with
+                # no intermediate bytes copy of the chunk
+                convert_vertex_chunk(vertex_ascii_data, has_normals).tofile(fout)
+                num_read += len(vertex_ascii_data)
+    print(f"{num_vertices} rays saved to {output_filepath}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert an ASCII ply ray cloud to the binary format used by "
+                                                 "raycloudtools.")
+    parser.add_argument('input_filepath', help="ASCII ply file to read")
+    parser.add_argument('output_filepath', help="binary ply file to write")
+    args = parser.parse_args()
+    try:
+        convert_ply_ascii_to_binary(args.input_filepath, args.output_filepath)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,107 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026
+# Commonwealth Scientific and Industrial Research Organisation (CSIRO)
+# ABN 41 687 119 230
+#
+# Prints the per-point uncertainty (variance) fields that raynoise appends to a
+# binary ray cloud, for a single point index. The vertex body is memory-mapped
+# with the record dtype from the header, so only the page holding the requested
+# record is actually read, however large the cloud is.
+#
+# usage: parse_binary_ply.py cloud.ply point_index
+import argparse
+import functools
+import sys
+
+# numpy is imported lazily where needed: this script is run once per queried
+# point from shell test loops, and for anything but a valid query the numpy
+# import would dwarf the actual work
+
+# the five uncertainty fields appended by raynoise
+UNCERTAINTY_FIELDS = ('var_x', 'var_y', 'var_z', 'var_range', 'var_total')
+
+PLY_TO_NUMPY_TYPE = {'char': 'i1', 'int8': 'i1', 'uchar': 'u1', 'uint8': 'u1', 'short': '<i2', 'int16': '<i2',
+                     'ushort': '<u2', 'uint16': '<u2', 'int': '<i4', 'int32': '<i4', 'uint': '<u4', 'uint32': '<u4',
+                     'float': '<f4', 'float32': '<f4', 'double': '<f8', 'float64': '<f8'}
+
+
+@functools.lru_cache(maxsize=16)
+def record_dtype_for(properties):
+    """Build (once per distinct property layout) the vertex record dtype."""
+    import numpy as np
+    return np.dtype(list(properties))
+
+
+def read_binary_ply_header(f, file_name):
+    """Parse the header of the binary ply file open on f.
+
+    Returns (num_vertices, vertex record dtype, header size in bytes)."""
+    if f.readline().strip() != b'ply':
+        raise ValueError(f"{file_name} is not a ply file")
+    num_vertices = None
+    properties = []
+    in_vertex_element = False
+    while True:
+        raw_line = f.readline()
+        if raw_line == b'':  # EOF, as opposed to a blank line's b'\n'
+            raise ValueError(f"unexpected end of header in {file_name}")
+        line = raw_line.decode('ascii', 'replace').strip()
+        if line == 'end_header':
+            break
+        parts = line.split()
+        if not parts or parts[0] == 'comment':
+            continue
+        if parts[0] == 'format':
+            if parts[1] != 'binary_little_endian':
+                raise ValueError(f"{file_name} is not a binary_little_endian ply file")
+        elif parts[0] == 'element':
+            in_vertex_element = parts[1] == 'vertex'
+            if in_vertex_element:
+                num_vertices = int(parts[2])
+            elif num_vertices is None:
+                raise ValueError(f"vertex must be the first element in {file_name}")
+        elif parts[0] == 'property' and in_vertex_element:
+            type_name, prop_name = parts[1], parts[2]
+            if type_name not in PLY_TO_NUMPY_TYPE:
+                raise ValueError(f"unsupported property type {type_name} in {file_name}")
+            properties.append((prop_name, PLY_TO_NUMPY_TYPE[type_name]))
+    if num_vertices is None:
+        raise ValueError(f"no vertex element in {file_name}")
+    return num_vertices, record_dtype_for(tuple(properties)), f.tell()
+
+
+def parse_ply_point_uncertainties(filepath, point_index):
+    """Return the five uncertainty values of the point at point_index as a dict.
+
+    The vertex records are memory-mapped rather than read, so the OS pages in
+    only the record actually accessed."""
+    import numpy as np
+    with open(filepath, 'rb') as f:
+        num_vertices, record_dtype, header_size = read_binary_ply_header(f, filepath)
+    if not 0 <= point_index < num_vertices:
+        raise ValueError(f"point index {point_index} out of range for {num_vertices} vertices")
+    missing_fields = set(UNCERTAINTY_FIELDS) - set(record_dtype.names)
+    if missing_fields:
+        raise ValueError(f"required fields {sorted(missing_fields)} missing from {filepath}")
+    vertices = np.memmap(filepath, dtype=record_dtype, mode='r', offset=header_size, shape=(num_vertices,))
+    point = vertices[point_index]
+    return {field_name: float(point[field_name]) for field_name in UNCERTAINTY_FIELDS}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Print the raynoise uncertainty fields of one point in a binary "
+                                                 "ply ray cloud.")
+    parser.add_argument('filepath', help="binary ply file to read")
+    parser.add_argument('point_index', type=int, help="index of the point to report")
+    args = parser.parse_args()
+    try:
+        uncertainties = parse_ply_point_uncertainties(args.filepath, args.point_index)
+    except (OSError, ValueError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    for field_name, value in uncertainties.items():
+        print(f"{field_name}: {value:.9g}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+# Copyright (c) 2026
+# Commonwealth Scientific and Industrial Research Organisation (CSIRO)
+# ABN 41 687 119 230
+#
+# Regression tests for the raynoise tool, which augments a ray cloud with
+# per-point uncertainty (variance) fields. Each test case runs raynoise on a
+# small input cloud and compares the uncertainty values of selected points
+# against values recorded from a blessed run.
+#
+# usage: test_raynoise.py path/to/raynoise data_dir output_dir
+import argparse
+import functools
+import io
+import os
+import subprocess
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+
+import numpy as np
+from plyfile import PlyData
+
+FLOAT_TOLERANCE = 1.0e-5
+
+# the five per-point uncertainty fields appended by raynoise, in file order
+UNCERTAINTY_FIELDS = ('var_x', 'var_y', 'var_z', 'var_range', 'var_total')
+
+TEST_CASES = [
+    {
+        'name': 'Basic_P1',
+        'input_file': 'test_basic.ply',
+        'args': ['--sigma', '0.02'],
+        'points_to_check': [
+            {'point_index': 0,
+             'expected': {'var_x': 4.0e-4, 'var_y': 4.0e-4, 'var_z': 4.0e-4, 'var_range': 4.0e-4,
+                          'var_total': 1.2e-3}},
+        ],
+    },
+    {
+        'name': 'Basic_P2',
+        'input_file': 'test_basic.ply',
+        'args': ['--sigma', '0.02'],
+        'points_to_check': [
+            {'point_index': 5,
+             'expected': {'var_x': 4.0e-4, 'var_y': 4.0e-4, 'var_z': 4.0e-4, 'var_range': 4.0e-4,
+                          'var_total': 1.2e-3}},
+        ],
+    },
+    {
+        'name': 'AoI_P1_check',
+        'input_file': 'test_aoi.ply',
+        'args': ['--sigma', '0.02', '--angle_of_incidence'],
+        'points_to_check': [
+            {'point_index': 2,
+             'expected': {'var_x': 4.8e-4, 'var_y': 4.0e-4, 'var_z': 4.0e-4, 'var_range': 5.6e-4,
+                          'var_total': 1.28e-3}},
+        ],
+    },
+    {
+        'name': 'AoI_P2_check',
+        'input_file': 'test_aoi.ply',
+        'args': ['--sigma', '0.02', '--angle_of_incidence'],
+        'points_to_check': [
+            {'point_index': 7,
+             'expected': {'var_x': 4.0e-4, 'var_y': 5.2e-4, 'var_z': 4.4e-4, 'var_range': 6.0e-4,
+                          'var_total': 1.36e-3}},
+        ],
+    },
+    {
+        'name': 'Mixed_P_test',
+        'input_file': 'test_mixed.ply',
+        'args': ['--sigma', '0.05', '--range_weighting'],
+        'points_to_check': [
+            {'point_index': 1,
+             'expected': {'var_x': 2.5e-3, 'var_y': 2.5e-3, 'var_z': 2.5e-3, 'var_range': 3.1e-3,
+                          'var_total': 7.5e-3}},
+        ],
+    },
+    {
+        'name': 'Mixed_SF1',
+        'input_file': 'test_mixed.ply',
+        'args': ['--sigma', '0.05', '--range_weighting'],
+        'points_to_check': [
+            {'point_index': 4,
+             'expected': {'var_x': 2.9e-3, 'var_y': 2.5e-3, 'var_z': 2.7e-3, 'var_range': 3.5e-3,
+                          'var_total': 8.1e-3}},
+        ],
+    },
+]
+
+
+@functools.lru_cache(maxsize=16)
+def read_vertex_data(ply_path, mtime):
+    """Parse a ply file's vertex data once per (path, mtime).
+
+    Keying on mtime means the cache entry is implicitly invalidated whenever
+    raynoise rewrites the file, so repeated checks against an unchanged output
+    share one parse."""
+    return PlyData.read(ply_path)['vertex'].data
+
+
+def group_test_cases(test_cases):
+    """Group test cases that share (input_file, args) so each distinct raynoise
+    invocation runs once, however many cases check points in its output."""
+    groups = {}
+    for test_case in test_cases:
+        key = (test_case['input_file'], tuple(test_case['args']))
+        group = groups.setdefault(key, {'input_file': test_case['input_file'], 'args': test_case['args'],
+                                        'checks': []})
+        for point_check in test_case['points_to_check']:
+            group['checks'].append((test_case['name'], point_check))
+    return list(groups.values())
+
+
+def run_test_group(group, raynoise_exe, data_dir, output_dir):
+    """Run raynoise once for a group of test cases and check every point check
+    in the group against the single parsed output.
+
+    Returns ({case name: passed}, log text). Output is gathered into a
+    per-group buffer so logs stay coherent when groups run in parallel."""
+    log = io.StringIO()
+    case_names = []
+    for case_name, _ in group['checks']:
+        if case_name not in case_names:
+            case_names.append(case_name)
+    case_passed = {case_name: True for case_name in case_names}
+    input_ply_path = os.path.join(data_dir, group['input_file'])
+    # the shared output is named after the group key rather than any one member
+    # case, so which cases share a raynoise run is visible in the file name and
+    # independent of case naming or ordering
+    group_name = '_'.join([os.path.splitext(group['input_file'])[0]] + [arg.lstrip('-') for arg in group['args']])
+    output_ply_path = os.path.join(output_dir, group_name + '_noise.ply')
+    command = [raynoise_exe, input_ply_path, output_ply_path] + group['args']
+    print(f"[{'/'.join(case_names)}] running: {' '.join(command)}", file=log)
+    # capture raw bytes: on success the output is discarded without ever going
+    # through the codec layer, which is not free for chatty raynoise logs
+    process_result = subprocess.run(command, capture_output=True, check=False)
+    if process_result.returncode != 0:
+        print(f"[{'/'.join(case_names)}] FAIL: raynoise exited with {process_result.returncode}", file=log)
+        print(process_result.stderr.decode('utf-8', 'replace'), file=log)
+        return {case_name: False for case_name in case_names}, log.getvalue()
+
+    # a missing or malformed output file must fail the group's cases, not
+    # escape the worker as a raw traceback and take the other groups' results
+    # with it, so the read-and-check section is guarded like the non-zero-exit
+    # branch above
+    try:
+        vertex_data = read_vertex_data(output_ply_path, os.path.getmtime(output_ply_path))
+        # gather every (point, field) comparison in the group into flat arrays
+        # so a single np.isclose call evaluates them all in C rather than one
+        # Python math.isclose call per value
+        check_refs = []
+        expected_values = []
+        actual_values = []
+        # one multi-field view up front, then a single structured extraction
+        # per point hands back all five uncertainty values as one tuple,
+        # instead of five separate 0-d scalar extractions per point
+        uncertainty_view = vertex_data[list(UNCERTAINTY_FIELDS)]
+        for case_name, point_check in group['checks']:
+            point_index = point_check['point_index']
+            actual_point = dict(zip(UNCERTAINTY_FIELDS, uncertainty_view[point_index].item()))
+            for field_name, expected_value in point_check['expected'].items():
+                check_refs.append((case_name, point_index, field_name))
+                expected_values.append(expected_value)
+                actual_values.append(actual_point[field_name])
+        expected = np.asarray(expected_values, dtype=np.float64)
+        actual = np.asarray(actual_values, dtype=np.float64)
+        mask = np.isclose(actual, expected, rtol=FLOAT_TOLERANCE, atol=FLOAT_TOLERANCE)
+        for i in np.where(~mask)[0]:
+            case_name, point_index, field_name = check_refs[i]
+            print(f"[{case_name}] FAIL: point {point_index} {field_name}: expected {expected[i]}, "
+                  f"got {actual[i]}", file=log)
+            case_passed[case_name] = False
+    except (OSError, KeyError, IndexError, ValueError) as e:
+        print(f"[{'/'.join(case_names)}] FAIL: could not check {output_ply_path}: {e!r}", file=log)
+        return {case_name: False for case_name in case_names}, log.getvalue()
+    for case_name in case_names:
+        if case_passed[case_name]:
+            print(f"[{case_name}] PASS", file=log)
+    return case_passed, log.getvalue()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Regression tests for raynoise.")
+    parser.add_argument('raynoise_exe', help="path to the raynoise executable")
+    parser.add_argument('data_dir', help="directory containing the test input ply files")
+    parser.add_argument('output_dir', help="directory to write raynoise output into")
+    args = parser.parse_args()
+    os.makedirs(args.output_dir, exist_ok=True)
+
+    # cases sharing an input and arguments reuse one raynoise run and one
+    # parsed output; the groups touch disjoint input/output files, so they
+    # parallelise cleanly across cores
+    groups = group_test_cases(TEST_CASES)
+    run_group = partial(run_test_group, raynoise_exe=args.raynoise_exe, data_dir=args.data_dir,
+                        output_dir=args.output_dir)
+    with ProcessPoolExecutor(max_workers=min(len(groups), os.cpu_count())) as executor:
+        results = list(executor.map(run_group, groups))
+
+    num_cases = 0
+    num_failed = 0
+    for case_passed, log_text in results:
+        sys.stdout.write(log_text)
+        num_cases += len(case_passed)
+        num_failed += sum(1 for passed in case_passed.values() if not passed)
+    print(f"{num_cases - num_failed}/{num_cases} test cases passed")
+    sys.exit(1 if num_failed else 0)
+
+
+if __name__ == '__main__':
+    main()